@@ -1,22 +1,52 @@
 """FastAPI application for ETF Overlap Analyzer."""
 
+import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 import logging
 
-from .sec_parser import get_etf_holdings, get_available_etfs, ETF_INFO
-from .overlap import calculate_overlap
+from .sec_parser import (
+    close_session,
+    get_etf_holdings,
+    get_available_etfs,
+    warm_memory_cache,
+    ETFHoldings,
+    ETF_INFO,
+)
+from .overlap import OverlapResult, calculate_overlap
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Supported tickers, computed once for request validation and error messages
+_VALID_TICKERS = frozenset(ETF_INFO)
+_VALID_TICKERS_LIST = list(ETF_INFO)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage resources shared across requests.
+
+    Args:
+        app: The FastAPI application.
+    """
+    warm_memory_cache()
+    yield
+    await close_session()
+
+
 app = FastAPI(
     title="ETF Overlap Analyzer",
     description="Analyze holdings overlap between ETFs using SEC EDGAR data",
     version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS for frontend
@@ -50,6 +80,8 @@ class OverlapRequest(BaseModel):
 class HoldingResponse(BaseModel):
     """Response model for a single holding."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     name: str
     cusip: str | None
     percentage: float
@@ -59,6 +91,8 @@ class HoldingResponse(BaseModel):
 class HoldingsResponse(BaseModel):
     """Response model for ETF holdings."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     ticker: str
     name: str
     holdings: list[HoldingResponse]
@@ -68,6 +102,8 @@ class HoldingsResponse(BaseModel):
 class OverlappingHoldingResponse(BaseModel):
     """Response model for an overlapping holding."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     name: str
     cusip: str | None
     weight_etf1: float
@@ -78,6 +114,8 @@ class OverlappingHoldingResponse(BaseModel):
 class OverlapResponse(BaseModel):
     """Response model for overlap analysis."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     etf1_ticker: str
     etf2_ticker: str
     etf1_name: str
@@ -107,7 +145,7 @@ async def list_etfs() -> list[ETFInfo]:
 
 
 @app.get("/api/holdings/{ticker}", response_model=HoldingsResponse)
-async def get_holdings(ticker: str) -> HoldingsResponse:
+async def get_holdings(ticker: str) -> ETFHoldings:
     """Get holdings for an ETF.
 
     Args:
@@ -121,10 +159,10 @@ async def get_holdings(ticker: str) -> HoldingsResponse:
     """
     ticker = ticker.upper()
 
-    if ticker not in ETF_INFO:
+    if ticker not in _VALID_TICKERS:
         raise HTTPException(
             status_code=404,
-            detail=f"ETF '{ticker}' not found. Available ETFs: {list(ETF_INFO.keys())}",
+            detail=f"ETF '{ticker}' not found. Available ETFs: {_VALID_TICKERS_LIST}",
         )
 
     holdings = await get_etf_holdings(ticker)
@@ -135,24 +173,11 @@ async def get_holdings(ticker: str) -> HoldingsResponse:
             detail=f"Could not fetch holdings for '{ticker}'. SEC data may be unavailable.",
         )
 
-    return HoldingsResponse(
-        ticker=holdings.ticker,
-        name=holdings.name,
-        holdings=[
-            HoldingResponse(
-                name=h.name,
-                cusip=h.cusip,
-                percentage=h.percentage,
-                value=h.value,
-            )
-            for h in holdings.holdings
-        ],
-        as_of_date=holdings.as_of_date,
-    )
+    return holdings
 
 
 @app.post("/api/overlap", response_model=OverlapResponse)
-async def analyze_overlap(request: OverlapRequest) -> OverlapResponse:
+async def analyze_overlap(request: OverlapRequest) -> OverlapResult:
     """Analyze overlap between two ETFs.
 
     Args:
@@ -169,10 +194,10 @@ async def analyze_overlap(request: OverlapRequest) -> OverlapResponse:
 
     # Validate tickers
     for ticker in [ticker1, ticker2]:
-        if ticker not in ETF_INFO:
+        if ticker not in _VALID_TICKERS:
             raise HTTPException(
                 status_code=404,
-                detail=f"ETF '{ticker}' not found. Available ETFs: {list(ETF_INFO.keys())}",
+                detail=f"ETF '{ticker}' not found. Available ETFs: {_VALID_TICKERS_LIST}",
             )
 
     if ticker1 == ticker2:
@@ -181,9 +206,10 @@ async def analyze_overlap(request: OverlapRequest) -> OverlapResponse:
             detail="Please select two different ETFs to compare.",
         )
 
-    # Fetch holdings for both ETFs
-    holdings1 = await get_etf_holdings(ticker1)
-    holdings2 = await get_etf_holdings(ticker2)
+    # Fetch holdings for both ETFs concurrently
+    holdings1, holdings2 = await asyncio.gather(
+        get_etf_holdings(ticker1), get_etf_holdings(ticker2)
+    )
 
     if holdings1 is None:
         raise HTTPException(
@@ -198,28 +224,7 @@ async def analyze_overlap(request: OverlapRequest) -> OverlapResponse:
         )
 
     # Calculate overlap
-    result = calculate_overlap(holdings1, holdings2)
-
-    return OverlapResponse(
-        etf1_ticker=result.etf1_ticker,
-        etf2_ticker=result.etf2_ticker,
-        etf1_name=result.etf1_name,
-        etf2_name=result.etf2_name,
-        overlap_percentage=result.overlap_percentage,
-        common_holdings_count=result.common_holdings_count,
-        etf1_total_holdings=result.etf1_total_holdings,
-        etf2_total_holdings=result.etf2_total_holdings,
-        top_overlapping=[
-            OverlappingHoldingResponse(
-                name=h.name,
-                cusip=h.cusip,
-                weight_etf1=h.weight_etf1,
-                weight_etf2=h.weight_etf2,
-                overlap_contribution=h.overlap_contribution,
-            )
-            for h in result.top_overlapping
-        ],
-    )
+    return calculate_overlap(holdings1, holdings2)
 
 
 @app.get("/health")
@@ -1,11 +1,12 @@
 """ETF overlap calculation logic."""
 
+import heapq
 from dataclasses import dataclass
 from typing import Optional
-from .sec_parser import ETFHoldings, Holding
+from .sec_parser import ETFHoldings
 
 
-@dataclass
+@dataclass(slots=True)
 class OverlappingHolding:
     """Represents a holding that appears in both ETFs."""
 
@@ -16,7 +17,7 @@ class OverlappingHolding:
     overlap_contribution: float
 
 
-@dataclass
+@dataclass(slots=True)
 class OverlapResult:
     """Result of an overlap analysis between two ETFs."""
 
@@ -45,25 +46,17 @@ def calculate_overlap(holdings1: ETFHoldings, holdings2: ETFHoldings) -> Overlap
     Returns:
         OverlapResult with overlap metrics and top overlapping positions.
     """
-    # Build lookup by CUSIP (more reliable than name matching)
-    etf1_by_cusip: dict[str, Holding] = {}
-    etf1_by_name: dict[str, Holding] = {}
-
-    for h in holdings1.holdings:
-        if h.cusip:
-            etf1_by_cusip[h.cusip] = h
-        etf1_by_name[h.name.upper()] = h
+    # Match by CUSIP (more reliable than name matching), falling back to name.
+    # The ETF1 lookups are cached on the holdings and reused across calls.
+    etf1_by_cusip = holdings1.by_cusip
 
     overlapping: list[OverlappingHolding] = []
     total_overlap = 0.0
 
     for h2 in holdings2.holdings:
-        # Try to match by CUSIP first, then by name
-        h1 = None
-        if h2.cusip and h2.cusip in etf1_by_cusip:
-            h1 = etf1_by_cusip[h2.cusip]
-        elif h2.name.upper() in etf1_by_name:
-            h1 = etf1_by_name[h2.name.upper()]
+        h1 = etf1_by_cusip.get(h2.cusip) if h2.cusip else None
+        if h1 is None:
+            h1 = holdings1.by_name.get(h2.name_upper)
 
         if h1:
             # Calculate overlap contribution (minimum of the two weights)
@@ -80,8 +73,10 @@ def calculate_overlap(holdings1: ETFHoldings, holdings2: ETFHoldings) -> Overlap
                 )
             )
 
-    # Sort by overlap contribution descending
-    overlapping.sort(key=lambda x: x.overlap_contribution, reverse=True)
+    # Top 10 overlapping positions by overlap contribution
+    top_overlapping = heapq.nlargest(
+        10, overlapping, key=lambda x: x.overlap_contribution
+    )
 
     return OverlapResult(
         etf1_ticker=holdings1.ticker,
@@ -92,5 +87,5 @@ def calculate_overlap(holdings1: ETFHoldings, holdings2: ETFHoldings) -> Overlap
         common_holdings_count=len(overlapping),
         etf1_total_holdings=len(holdings1.holdings),
         etf2_total_holdings=len(holdings2.holdings),
-        top_overlapping=overlapping[:10],  # Top 10 overlapping positions
+        top_overlapping=top_overlapping,
     )
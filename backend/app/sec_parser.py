@@ -1,25 +1,56 @@
 """SEC EDGAR N-PORT filing parser for ETF holdings data."""
 
 import asyncio
-import re
-import xml.etree.ElementTree as ET
-from dataclasses import dataclass
+import codecs
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import zlib
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from dataclasses import dataclass, field
 from typing import Optional
 import aiohttp
+import orjson
+from lxml import etree
 import logging
 from pathlib import Path
-import json
 from datetime import datetime, timedelta
+from functools import partial
+from operator import attrgetter
 
 logger = logging.getLogger(__name__)
 
 # SEC requires a User-Agent header with contact info
 SEC_USER_AGENT = "ETF-Overlap-Analyzer/1.0 (contact@example.com)"
 
+# SEC allows 10 requests per second. Up to SEC_REQUEST_BURST requests may start
+# at once, with one more allowed every SEC_REQUEST_INTERVAL seconds, so no
+# one-second window exceeds 5 + 1 / 0.2 = 10 requests
+SEC_REQUEST_BURST = 5
+SEC_REQUEST_INTERVAL = 0.2
+
 # Cache directory for SEC responses
 CACHE_DIR = Path(__file__).parent.parent / "cache"
 CACHE_EXPIRY_HOURS = 24
 
+# Maximum number of ETFs kept in the in-process cache
+MEMORY_CACHE_MAX_ENTRIES = 64
+
+# N-PORT invstOrSec child elements read for each holding, by local name
+_HOLDING_FIELDS = frozenset({"name", "cusip", "pctVal", "valUSD"})
+
+# Form types of original and amended N-PORT filings
+_NPORT_FORMS = frozenset({"NPORT-P", "NPORT-P/A"})
+
+# Local name of each child tag seen so far, so namespaces are split once per tag
+_LOCAL_NAMES: dict[str, str] = {}
+
 # ETF ticker to SEC filing info mapping
 # Each entry contains: CIK (for the fund series), series_id (to identify specific fund in filing)
 ETF_INFO = {
@@ -51,24 +82,78 @@ ETF_INFO = {
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Holding:
-    """Represents a single ETF holding."""
+    """Represents a single ETF holding.
+
+    The normalized (stripped, upper-cased) name used for name matching is
+    computed once here rather than on every overlap lookup. Match keys are
+    interned, so the same CUSIP or name in two ETFs is one shared string and
+    compares by identity.
+    """
 
     name: str
     cusip: Optional[str]
     percentage: float
     value: Optional[float] = None
+    name_upper: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Intern the CUSIP and derive the interned normalized name."""
+        if self.cusip:
+            object.__setattr__(self, "cusip", sys.intern(self.cusip))
+        name_upper = sys.intern(self.name.strip().upper())
+        object.__setattr__(self, "name_upper", name_upper)
 
 
-@dataclass
+@dataclass(slots=True)
 class ETFHoldings:
-    """Represents all holdings for an ETF."""
+    """Represents all holdings for an ETF.
+
+    Lookup indexes over the holdings are built on first use and reused, since
+    the same instance is served from the in-process cache for many requests.
+    The holdings list should not be modified after an index has been built.
+    """
 
     ticker: str
     name: str
     holdings: list[Holding]
     as_of_date: Optional[str] = None
+    _by_cusip: Optional[dict[str, Holding]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _by_name: Optional[dict[str, Holding]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def by_cusip(self) -> dict[str, Holding]:
+        """Holdings keyed by CUSIP, for holdings that have one."""
+        if self._by_cusip is None:
+            self._by_cusip = {h.cusip: h for h in self.holdings if h.cusip}
+        return self._by_cusip
+
+    @property
+    def by_name(self) -> dict[str, Holding]:
+        """Holdings keyed by normalized name."""
+        if self._by_name is None:
+            self._by_name = {h.name_upper: h for h in self.holdings}
+        return self._by_name
+
+
+# In-process LRU cache of holdings keyed by ticker, checked before the disk cache.
+# Each entry stores the time the data was cached so it expires with the file cache.
+_MEM_CACHE: OrderedDict[str, tuple[datetime, ETFHoldings]] = OrderedDict()
+
+# SEC fetches currently in progress, keyed by ticker, so that concurrent cache
+# misses for the same ETF share a single fetch instead of each hitting SEC.
+_INFLIGHT: dict[str, asyncio.Task[Optional[ETFHoldings]]] = {}
+
+# Shared HTTP session so connections to SEC hosts are kept alive across fetches
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+# Time (time.monotonic) at which the SEC request budget is fully refilled
+_rate_limit_full_at = 0.0
 
 
 def _get_cache_path(ticker: str) -> Path:
@@ -81,7 +166,7 @@ def _get_cache_path(ticker: str) -> Path:
         Path to the cache file.
     """
     CACHE_DIR.mkdir(parents=True, exist_ok=True)
-    return CACHE_DIR / f"{ticker.upper()}_holdings.json"
+    return CACHE_DIR / f"{ticker.upper()}_holdings.json.gz"
 
 
 def _is_cache_valid(cache_path: Path) -> bool:
@@ -114,23 +199,136 @@ def _load_from_cache(ticker: str) -> Optional[ETFHoldings]:
         return None
 
     try:
-        with open(cache_path, "r") as f:
-            data = json.load(f)
-        holdings = [Holding(**h) for h in data["holdings"]]
+        data = orjson.loads(gzip.decompress(cache_path.read_bytes()))
+        columns = data["columns"]
+        names = columns["name"]
+        cusips = columns["cusip"]
+        percentages = columns["percentage"]
+        values = columns["value"]
+        if not len(names) == len(cusips) == len(percentages) == len(values):
+            raise ValueError("cache columns have different lengths")
+        # Positional construction via map avoids building kwargs for each row
+        holdings = list(map(Holding, names, cusips, percentages, values))
         return ETFHoldings(
             ticker=data["ticker"],
             name=data["name"],
             holdings=holdings,
             as_of_date=data.get("as_of_date"),
         )
-    except (json.JSONDecodeError, KeyError) as e:
+    except (
+        OSError,
+        EOFError,
+        zlib.error,
+        KeyError,
+        ValueError,
+        TypeError,
+        AttributeError,
+    ) as e:
         logger.warning(f"Failed to load cache for {ticker}: {e}")
         return None
 
 
+def _load_from_memory(ticker: str) -> Optional[ETFHoldings]:
+    """Load holdings from the in-process cache if present and not expired.
+
+    Args:
+        ticker: The ETF ticker symbol.
+
+    Returns:
+        ETFHoldings if cache hit, None otherwise.
+    """
+    entry = _MEM_CACHE.get(ticker)
+    if entry is None:
+        return None
+
+    cached_at, holdings = entry
+    if datetime.now() - cached_at >= timedelta(hours=CACHE_EXPIRY_HOURS):
+        del _MEM_CACHE[ticker]
+        return None
+
+    _MEM_CACHE.move_to_end(ticker)
+    return holdings
+
+
+def _save_to_memory(holdings: ETFHoldings, cached_at: datetime) -> None:
+    """Save holdings to the in-process cache, evicting the least recently used.
+
+    Args:
+        holdings: The ETF holdings to cache.
+        cached_at: When the holdings were cached, used for expiry.
+    """
+    _MEM_CACHE[holdings.ticker] = (cached_at, holdings)
+    _MEM_CACHE.move_to_end(holdings.ticker)
+    while len(_MEM_CACHE) > MEMORY_CACHE_MAX_ENTRIES:
+        _MEM_CACHE.popitem(last=False)
+
+
+def _get_cache_time(ticker: str) -> datetime:
+    """Get when the cache file for an ETF ticker was written.
+
+    Args:
+        ticker: The ETF ticker symbol.
+
+    Returns:
+        The cache file modification time.
+    """
+    return datetime.fromtimestamp(_get_cache_path(ticker).stat().st_mtime)
+
+
+def warm_memory_cache() -> None:
+    """Load all valid disk caches into the in-process cache.
+
+    The overlap lookups are built up front as well, so the first request
+    for each cached ETF does no parsing or indexing. A cache that fails to
+    load is logged and skipped, so it cannot stop the app from starting.
+    """
+    for ticker in ETF_INFO:
+        try:
+            cached = _load_from_cache(ticker)
+            if cached:
+                _ = cached.by_cusip, cached.by_name
+                _save_to_memory(cached, _get_cache_time(ticker))
+                logger.info(f"Warmed {ticker} holdings from cache")
+        except Exception as e:
+            logger.warning(f"Failed to warm {ticker} holdings from cache: {e}")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file via a temporary sibling that is then renamed into place.
+
+    A crash mid-write leaves the previous file intact rather than a
+    truncated one. The temporary file has a unique name, so concurrent
+    writers of the same path (such as several server processes sharing the
+    cache directory) never write into each other's file.
+
+    Args:
+        path: Destination file path.
+        data: File contents.
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp"
+    )
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def _save_to_cache(holdings: ETFHoldings) -> None:
     """Save holdings to cache.
 
+    Holdings are stored column-wise (one list per field) rather than as a
+    list of objects, which avoids repeating every key for every holding.
+    The file is gzip-compressed at the fastest level and written atomically.
+
+    A SHA-256 of the uncompressed payload is kept in a sidecar file. When a
+    refresh produces the same holdings as the file on disk, the file is only
+    touched to restart its expiry instead of being compressed and rewritten.
+
     Args:
         holdings: The ETF holdings to cache.
     """
@@ -138,42 +336,229 @@ def _save_to_cache(holdings: ETFHoldings) -> None:
     data = {
         "ticker": holdings.ticker,
         "name": holdings.name,
-        "holdings": [
-            {
-                "name": h.name,
-                "cusip": h.cusip,
-                "percentage": h.percentage,
-                "value": h.value,
-            }
-            for h in holdings.holdings
-        ],
+        "columns": {
+            "name": [h.name for h in holdings.holdings],
+            "cusip": [h.cusip for h in holdings.holdings],
+            "percentage": [h.percentage for h in holdings.holdings],
+            "value": [h.value for h in holdings.holdings],
+        },
         "as_of_date": holdings.as_of_date,
     }
-    with open(cache_path, "w") as f:
-        json.dump(data, f, indent=2)
+    payload = orjson.dumps(data)
+    digest = hashlib.sha256(payload).hexdigest()
+    digest_path = cache_path.with_name(cache_path.name + ".sha256")
+
+    try:
+        if cache_path.exists() and digest_path.read_text() == digest:
+            os.utime(cache_path)
+            return
+    except FileNotFoundError:
+        pass
+
+    # Drop the old digest first so it can never vouch for different contents
+    digest_path.unlink(missing_ok=True)
+    _write_atomic(cache_path, gzip.compress(payload, compresslevel=1, mtime=0))
+    digest_path.write_text(digest)
+
+
+def _get_submissions_cache_path(cik_padded: str) -> Path:
+    """Get the path of the cached submissions lookup for a CIK.
+
+    Args:
+        cik_padded: The SEC CIK number, zero-padded to 10 digits.
+
+    Returns:
+        Path to the submissions cache file.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    return CACHE_DIR / f"CIK{cik_padded}_submissions.json"
+
+
+def _load_submissions_cache(cik_padded: str) -> Optional[dict[str, Optional[str]]]:
+    """Load the validators and accession from the last submissions fetch.
+
+    Args:
+        cik_padded: The SEC CIK number, zero-padded to 10 digits.
+
+    Returns:
+        Dict with "etag", "last_modified" and "accession", or None if there
+        is no usable cached lookup.
+    """
+    cache_path = _get_submissions_cache_path(cik_padded)
+    if not cache_path.exists():
+        return None
+
+    try:
+        data = orjson.loads(cache_path.read_bytes())
+        if not data["accession"] or not (data["etag"] or data["last_modified"]):
+            return None
+        return data
+    except (OSError, KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Failed to load submissions cache for CIK {cik_padded}: {e}")
+        return None
+
+
+def _save_submissions_cache(
+    cik_padded: str,
+    accession: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+) -> None:
+    """Save the latest N-PORT accession with the validators SEC returned.
+
+    Args:
+        cik_padded: The SEC CIK number, zero-padded to 10 digits.
+        accession: Accession number of the latest N-PORT filing.
+        etag: ETag header of the submissions response, if any.
+        last_modified: Last-Modified header of the submissions response, if any.
+    """
+    if not etag and not last_modified:
+        return
+
+    cache_path = _get_submissions_cache_path(cik_padded)
+    data = {"etag": etag, "last_modified": last_modified, "accession": accession}
+    _write_atomic(cache_path, orjson.dumps(data))
+
+
+def _get_session() -> aiohttp.ClientSession:
+    """Get the shared SEC HTTP session, creating it on first use.
+
+    Returns:
+        The aiohttp session with SEC headers and a pooled connector.
+    """
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            headers={"User-Agent": SEC_USER_AGENT},
+            connector=aiohttp.TCPConnector(
+                limit=10, ttl_dns_cache=300, keepalive_timeout=75
+            ),
+        )
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared SEC HTTP session if it is open."""
+    global _SESSION
+    if _SESSION is not None and not _SESSION.closed:
+        await _SESSION.close()
+    _SESSION = None
+
+
+async def _wait_for_rate_limit(
+    delay: float = SEC_REQUEST_INTERVAL, burst: int = SEC_REQUEST_BURST
+) -> None:
+    """Wait until the request budget allows another SEC request.
+
+    This is a token bucket holding `burst` requests that regains one every
+    `delay` seconds, tracked as the time the bucket will be full again. Up to
+    `burst` requests start immediately, so a cold fetch's few back-to-back
+    requests pay no sleep. Each caller reserves its slot before sleeping, so
+    concurrent requests beyond the burst are spaced out rather than all
+    waking at once.
+
+    Args:
+        delay: Seconds for the budget to regain one request.
+        burst: Maximum number of requests that may start at once.
+    """
+    global _rate_limit_full_at
+    now = time.monotonic()
+    full_at = max(now, _rate_limit_full_at)
+    start = max(now, full_at - (burst - 1) * delay)
+    _rate_limit_full_at = full_at + delay
+    if start > now:
+        await asyncio.sleep(start - now)
 
 
 async def _fetch_with_rate_limit(
-    session: aiohttp.ClientSession, url: str, delay: float = 0.1
-) -> str:
+    session: aiohttp.ClientSession, url: str, delay: float = SEC_REQUEST_INTERVAL
+) -> bytes:
     """Fetch URL with rate limiting for SEC compliance.
 
     Args:
         session: The aiohttp session.
         url: URL to fetch.
-        delay: Delay in seconds between requests.
+        delay: Seconds for the rate limiter to regain one request.
+
+    Returns:
+        Raw response body, left undecoded for the JSON parser.
+
+    Raises:
+        aiohttp.ClientError: If the request fails.
+    """
+    await _wait_for_rate_limit(delay)
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.read()
+
+
+async def _fetch_if_modified(
+    session: aiohttp.ClientSession,
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    delay: float = SEC_REQUEST_INTERVAL,
+) -> tuple[Optional[bytes], Optional[str], Optional[str]]:
+    """Fetch URL with rate limiting, unless it is unchanged since a prior fetch.
+
+    Args:
+        session: The aiohttp session.
+        url: URL to fetch.
+        etag: ETag from the prior response, sent as If-None-Match.
+        last_modified: Last-Modified from the prior response, sent as
+            If-Modified-Since.
+        delay: Seconds for the rate limiter to regain one request.
 
     Returns:
-        Response text.
+        Tuple of the raw response body (None if SEC answered 304 Not
+        Modified), and the response's ETag and Last-Modified headers.
 
     Raises:
         aiohttp.ClientError: If the request fails.
     """
-    await asyncio.sleep(delay)  # Rate limiting
-    headers = {"User-Agent": SEC_USER_AGENT}
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    await _wait_for_rate_limit(delay)
     async with session.get(url, headers=headers) as response:
+        if response.status == 304:
+            return None, etag, last_modified
         response.raise_for_status()
-        return await response.text()
+        return (
+            await response.read(),
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+
+async def _fetch_xml_streaming(
+    session: aiohttp.ClientSession,
+    url: str,
+    delay: float = SEC_REQUEST_INTERVAL,
+    chunk_size: int = 64 * 1024,
+) -> AsyncIterator[bytes]:
+    """Fetch URL with rate limiting, yielding the body in chunks as it arrives.
+
+    Args:
+        session: The aiohttp session.
+        url: URL to fetch.
+        delay: Seconds for the rate limiter to regain one request.
+        chunk_size: Maximum size in bytes of each chunk.
+
+    Yields:
+        Chunks of the raw response body.
+
+    Raises:
+        aiohttp.ClientError: If the request fails.
+    """
+    await _wait_for_rate_limit(delay)
+    async with session.get(url) as response:
+        response.raise_for_status()
+        async for chunk in response.content.iter_chunked(chunk_size):
+            yield chunk
 
 
 async def _search_nport_by_series(
@@ -195,8 +580,7 @@ async def _search_nport_by_series(
     )
 
     try:
-        text = await _fetch_with_rate_limit(session, search_url)
-        data = json.loads(text)
+        data = orjson.loads(await _fetch_with_rate_limit(session, search_url))
 
         hits = data.get("hits", {}).get("hits", [])
         cik_padded = cik.lstrip("0").zfill(10)
@@ -257,18 +641,37 @@ async def _get_latest_nport_url(
         submissions_url = f"https://data.sec.gov/submissions/CIK{cik_padded}.json"
 
         try:
-            text = await _fetch_with_rate_limit(session, submissions_url)
-            data = json.loads(text)
+            # Revalidate the previous lookup so an unchanged submissions
+            # document comes back as a bodyless 304 instead of being reparsed
+            cached = _load_submissions_cache(cik_padded) or {}
+            body, etag, last_modified = await _fetch_if_modified(
+                session,
+                submissions_url,
+                etag=cached.get("etag"),
+                last_modified=cached.get("last_modified"),
+            )
 
-            filings = data.get("filings", {}).get("recent", {})
-            forms = filings.get("form", [])
-            accession_numbers = filings.get("accessionNumber", [])
+            if body is None:
+                accession_to_use = cached["accession"]
+            else:
+                data = orjson.loads(body)
 
-            # Find first NPORT filing
-            for i, form in enumerate(forms):
-                if form in ("NPORT-P", "NPORT-P/A"):
-                    accession_to_use = accession_numbers[i]
-                    break
+                filings = data.get("filings", {}).get("recent", {})
+                forms = filings.get("form", [])
+                accession_numbers = filings.get("accessionNumber", [])
+
+                # Recent filings are listed newest first, so stop at the first
+                # N-PORT and index straight into the parallel accession list
+                index = next(
+                    (i for i, form in enumerate(forms) if form in _NPORT_FORMS), None
+                )
+                if index is not None:
+                    accession_to_use = accession_numbers[index]
+
+                if accession_to_use:
+                    _save_submissions_cache(
+                        cik_padded, accession_to_use, etag, last_modified
+                    )
 
         except Exception as e:
             logger.error(f"Error fetching submissions for CIK {cik}: {e}")
@@ -283,8 +686,7 @@ async def _get_latest_nport_url(
     index_url = f"https://www.sec.gov/Archives/edgar/data/{cik_padded}/{accession_no_dash}/index.json"
 
     try:
-        index_text = await _fetch_with_rate_limit(session, index_url)
-        index_data = json.loads(index_text)
+        index_data = orjson.loads(await _fetch_with_rate_limit(session, index_url))
 
         # Find the XML file name
         xml_name = None
@@ -311,145 +713,241 @@ async def _get_latest_nport_url(
     return None
 
 
-def _parse_nport_xml(
-    xml_content: str, series_id: Optional[str] = None
-) -> list[Holding]:
-    """Parse N-PORT XML content to extract holdings.
+def _parse_holding(inv: etree._Element) -> Optional[Holding]:
+    """Extract a holding from an N-PORT invstOrSec element.
 
     Args:
-        xml_content: The XML content of the N-PORT filing.
-        series_id: Optional series ID to filter for specific fund.
+        inv: The invstOrSec element.
 
     Returns:
-        List of holdings extracted from the filing.
+        The holding, or None if it has no positive weight.
     """
-    holdings = []
+    # Read all wanted fields in one pass over the children, matching on
+    # local name so any namespace (or none) is accepted
+    fields: dict[str, Optional[str]] = {}
+    for child in inv:
+        tag = child.tag
+        if not isinstance(tag, str):  # Comments and processing instructions
+            continue
+        local_name = _LOCAL_NAMES.get(tag)
+        if local_name is None:
+            local_name = _LOCAL_NAMES[tag] = etree.QName(tag).localname
+        if local_name in _HOLDING_FIELDS and local_name not in fields:
+            fields[local_name] = child.text
 
-    # Try to extract namespace from the XML content
-    ns_match = re.search(r'xmlns="([^"]+)"', xml_content)
-    default_ns = ns_match.group(1) if ns_match else ""
+    name = fields.get("name")
+    name = name.strip() if name else "Unknown"
 
-    try:
-        root = ET.fromstring(xml_content)
-    except ET.ParseError as e:
-        logger.error(f"Failed to parse XML: {e}")
-        # Try to clean the XML and parse again
-        try:
-            # Remove any BOM or leading whitespace
-            cleaned = xml_content.strip()
-            if cleaned.startswith("\ufeff"):
-                cleaned = cleaned[1:]
-            root = ET.fromstring(cleaned)
-        except ET.ParseError as e2:
-            logger.error(f"Failed to parse cleaned XML: {e2}")
-            return holdings
-
-    # Build namespace dict dynamically
-    namespaces = {}
-    if default_ns:
-        namespaces["ns"] = default_ns
-
-    # Try multiple approaches to find investment/security elements
-    invstOrSecs = []
-
-    # Approach 1: Try with detected namespace
-    if namespaces:
-        invstOrSecs = root.findall(".//{%s}invstOrSec" % default_ns)
-
-    # Approach 2: Try common SEC namespaces
-    if not invstOrSecs:
-        for ns_uri in [
-            "http://www.sec.gov/edgar/nport",
-            "http://www.sec.gov/edgar/nportfiling",
-            "http://www.sec.gov/edgar/document/nport",
-        ]:
-            invstOrSecs = root.findall(".//{%s}invstOrSec" % ns_uri)
-            if invstOrSecs:
-                default_ns = ns_uri
-                break
+    cusip = fields.get("cusip")
+    cusip = cusip.strip() if cusip else None
 
-    # Approach 3: Try without namespace using local-name()
-    if not invstOrSecs:
-        # Use iter to find elements by local name
-        invstOrSecs = [
-            elem
-            for elem in root.iter()
-            if elem.tag.endswith("}invstOrSec") or elem.tag == "invstOrSec"
-        ]
+    # Percentage of net assets
+    pct = fields.get("pctVal")
+    percentage = float(pct) if pct else 0.0
 
-    logger.info(f"Found {len(invstOrSecs)} investment/security elements")
+    val = fields.get("valUSD")
+    value = float(val) if val else None
 
-    for inv in invstOrSecs:
-        try:
-            # Helper function to find element by local name
-            def find_elem(parent: ET.Element, local_name: str) -> Optional[ET.Element]:
-                # Try with namespace
-                if default_ns:
-                    elem = parent.find("{%s}%s" % (default_ns, local_name))
-                    if elem is not None:
-                        return elem
-                # Try without namespace
-                elem = parent.find(local_name)
-                if elem is not None:
-                    return elem
-                # Try iterating children
-                for child in parent:
-                    if child.tag.endswith("}" + local_name) or child.tag == local_name:
-                        return child
-                return None
-
-            # Extract name
-            name_elem = find_elem(inv, "name")
-            name = (
-                name_elem.text.strip()
-                if name_elem is not None and name_elem.text
-                else "Unknown"
-            )
+    if percentage <= 0:  # Only include holdings with positive weight
+        return None
 
-            # Extract CUSIP
-            cusip_elem = find_elem(inv, "cusip")
-            cusip = (
-                cusip_elem.text.strip()
-                if cusip_elem is not None and cusip_elem.text
-                else None
-            )
+    return Holding(name=name, cusip=cusip, percentage=percentage, value=value)
 
-            # Extract percentage of net assets
-            pct_elem = find_elem(inv, "pctVal")
-            percentage = (
-                float(pct_elem.text) if pct_elem is not None and pct_elem.text else 0.0
-            )
 
-            # Extract value
-            val_elem = find_elem(inv, "valUSD")
-            value = (
-                float(val_elem.text) if val_elem is not None and val_elem.text else None
-            )
+def _new_nport_parser() -> etree.XMLPullParser:
+    """Create an incremental parser for N-PORT filings.
 
-            if percentage > 0:  # Only include holdings with positive weight
-                holdings.append(
-                    Holding(
-                        name=name,
-                        cusip=cusip,
-                        percentage=percentage,
-                        value=value,
-                    )
-                )
+    Returns:
+        A pull parser that reports each completed invstOrSec element.
+    """
+    # "{*}" matches the tag in any namespace, or none
+    return etree.XMLPullParser(events=("end",), tag="{*}invstOrSec")
+
+
+def _read_holdings(parser: etree.XMLPullParser, holdings: list[Holding]) -> None:
+    """Extract holdings from the invstOrSec elements parsed so far.
+
+    Each element is freed once read, along with any already-processed
+    siblings, so the document tree never grows beyond the current element.
+
+    Args:
+        parser: The N-PORT pull parser.
+        holdings: List to append extracted holdings to.
+    """
+    for _, inv in parser.read_events():
+        try:
+            holding = _parse_holding(inv)
+            if holding is not None:
+                holdings.append(holding)
         except (AttributeError, ValueError) as e:
             logger.debug(f"Error parsing holding: {e}")
-            continue
 
-    # Sort by percentage descending
-    holdings.sort(key=lambda h: h.percentage, reverse=True)
+        inv.clear(keep_tail=True)
+        while inv.getprevious() is not None:
+            del inv.getparent()[0]
+
+
+def _feed_nport_parser(
+    parser: etree.XMLPullParser, chunk: Optional[bytes], holdings: list[Holding]
+) -> None:
+    """Feed a chunk of an N-PORT filing to the parser and extract holdings.
+
+    Args:
+        parser: The N-PORT pull parser.
+        chunk: The next chunk of the filing, or None to close the parser.
+        holdings: List to append extracted holdings to.
+
+    Raises:
+        etree.XMLSyntaxError: If the filing is not well-formed XML.
+    """
+    if chunk is None:
+        parser.close()
+    else:
+        parser.feed(chunk)
+    _read_holdings(parser, holdings)
+
+
+def _strip_xml_prolog_padding(chunk: bytes) -> bytes:
+    """Strip whitespace and a UTF-8 byte order mark from the start of a filing.
+
+    Some filings have a newline or BOM before the XML declaration, which the
+    parser rejects because the declaration must come first.
+
+    Args:
+        chunk: The leading chunk of the filing.
+
+    Returns:
+        The chunk without leading whitespace or BOM.
+    """
+    return chunk.lstrip().removeprefix(codecs.BOM_UTF8).lstrip()
+
+
+async def _stream_nport_holdings(
+    session: aiohttp.ClientSession, url: str
+) -> list[Holding]:
+    """Fetch an N-PORT filing and parse its holdings as the body arrives.
+
+    Parsing runs in a worker thread so large filings do not block the event
+    loop while other requests are being served. Each filing gets its own
+    single-thread executor, because libxml2 does not allow a parser to be
+    used from more than one thread over its lifetime.
+
+    Args:
+        session: The aiohttp session.
+        url: URL of the N-PORT XML filing.
+
+    Returns:
+        List of holdings extracted from the filing, in document order.
+
+    Raises:
+        aiohttp.ClientError: If the request fails.
+    """
+    loop = asyncio.get_running_loop()
+    holdings: list[Holding] = []
+
+    started = False
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="nport") as executor:
+        parser = await loop.run_in_executor(executor, _new_nport_parser)
+        try:
+            # aclosing releases the response as soon as parsing fails, rather
+            # than when the abandoned generator is garbage-collected
+            async with aclosing(_fetch_xml_streaming(session, url)) as chunks:
+                async for chunk in chunks:
+                    if not started:
+                        chunk = _strip_xml_prolog_padding(chunk)
+                        if not chunk:
+                            continue
+                        started = True
+                    await loop.run_in_executor(
+                        executor, _feed_nport_parser, parser, chunk, holdings
+                    )
+            await loop.run_in_executor(
+                executor, _feed_nport_parser, parser, None, holdings
+            )
+        except etree.XMLSyntaxError as e:
+            logger.error(f"Failed to parse XML: {e}")
+            return []
+
+    logger.info(f"Parsed {len(holdings)} holdings")
 
     return holdings
 
 
+async def _fetch_etf_holdings(ticker: str) -> Optional[ETFHoldings]:
+    """Fetch holdings for an ETF from SEC EDGAR and cache the result.
+
+    Args:
+        ticker: The upper-cased ETF ticker symbol.
+
+    Returns:
+        ETFHoldings object with the holdings data, or None if not found.
+    """
+    etf_info = ETF_INFO[ticker]
+    session = _get_session()
+
+    # Get latest N-PORT filing URL (pass series_id to find correct filing for multi-fund trusts)
+    filing_url = await _get_latest_nport_url(
+        session, etf_info["cik"], etf_info.get("series_id")
+    )
+    if not filing_url:
+        return None
+
+    logger.info(f"Fetching N-PORT filing from: {filing_url}")
+
+    try:
+        holdings = await _stream_nport_holdings(session, filing_url)
+    except aiohttp.ClientError as e:
+        logger.error(f"Failed to fetch N-PORT filing: {e}")
+        return None
+
+    if not holdings:
+        logger.warning(f"No holdings found in N-PORT filing for {ticker}")
+        return None
+
+    # Sort by percentage descending once, so cached holdings are served in order
+    holdings.sort(key=attrgetter("percentage"), reverse=True)
+
+    result = ETFHoldings(
+        ticker=ticker,
+        name=etf_info["name"],
+        holdings=holdings,
+    )
+
+    # Save to cache
+    _save_to_cache(result)
+    _save_to_memory(result, datetime.now())
+
+    return result
+
+
+def _finish_inflight_fetch(
+    ticker: str, task: asyncio.Task[Optional[ETFHoldings]]
+) -> None:
+    """Forget a finished SEC fetch and log any error it raised.
+
+    Callers await the fetch through asyncio.shield, so if every caller was
+    cancelled nobody else retrieves the task's exception.
+
+    Args:
+        ticker: The upper-cased ETF ticker symbol.
+        task: The finished fetch task.
+    """
+    if _INFLIGHT.get(ticker) is task:
+        del _INFLIGHT[ticker]
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(
+            f"Failed to fetch holdings for {ticker}", exc_info=task.exception()
+        )
+
+
 async def get_etf_holdings(
     ticker: str, force_refresh: bool = False
 ) -> Optional[ETFHoldings]:
     """Get holdings for an ETF by ticker.
 
+    Concurrent calls that miss the cache for the same ticker share a single
+    SEC fetch.
+
     Args:
         ticker: The ETF ticker symbol (e.g., 'SPY', 'QQQ').
         force_refresh: If True, bypass cache and fetch fresh data.
@@ -463,48 +961,26 @@ async def get_etf_holdings(
         logger.error(f"Unknown ETF ticker: {ticker}")
         return None
 
-    # Check cache first
+    # Check in-process cache, then disk cache
     if not force_refresh:
+        cached = _load_from_memory(ticker)
+        if cached:
+            return cached
+
         cached = _load_from_cache(ticker)
         if cached:
             logger.info(f"Loaded {ticker} holdings from cache")
+            _save_to_memory(cached, _get_cache_time(ticker))
             return cached
 
-    etf_info = ETF_INFO[ticker]
-
-    async with aiohttp.ClientSession() as session:
-        # Get latest N-PORT filing URL (pass series_id to find correct filing for multi-fund trusts)
-        filing_url = await _get_latest_nport_url(
-            session, etf_info["cik"], etf_info.get("series_id")
-        )
-        if not filing_url:
-            return None
-
-        logger.info(f"Fetching N-PORT filing from: {filing_url}")
-
-        try:
-            xml_content = await _fetch_with_rate_limit(session, filing_url)
-        except aiohttp.ClientError as e:
-            logger.error(f"Failed to fetch N-PORT filing: {e}")
-            return None
-
-        # Parse the XML
-        holdings = _parse_nport_xml(xml_content, etf_info.get("series_id"))
-
-        if not holdings:
-            logger.warning(f"No holdings found in N-PORT filing for {ticker}")
-            return None
-
-        result = ETFHoldings(
-            ticker=ticker,
-            name=etf_info["name"],
-            holdings=holdings,
-        )
-
-        # Save to cache
-        _save_to_cache(result)
+    task = _INFLIGHT.get(ticker)
+    if task is None:
+        task = asyncio.create_task(_fetch_etf_holdings(ticker))
+        _INFLIGHT[ticker] = task
+        task.add_done_callback(partial(_finish_inflight_fetch, ticker))
 
-        return result
+    # Shield so a cancelled caller does not cancel the fetch other callers await
+    return await asyncio.shield(task)
 
 
 def get_available_etfs() -> list[dict]:
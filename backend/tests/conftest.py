@@ -0,0 +1,20 @@
+"""Shared pytest fixtures."""
+
+from collections.abc import AsyncIterator
+
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client() -> AsyncIterator[AsyncClient]:
+    """Create one HTTP client bound to the FastAPI app for the whole suite.
+
+    Tests using it must run in the session event loop, via
+    ``@pytest.mark.asyncio(loop_scope="session")``.
+    """
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
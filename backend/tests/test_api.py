@@ -1,10 +1,9 @@
 """Tests for FastAPI endpoints."""
 
 import pytest
-from httpx import AsyncClient, ASGITransport
+from httpx import AsyncClient
 from unittest.mock import patch, AsyncMock
 
-from app.main import app
 from app.sec_parser import ETFHoldings, Holding
 
 
@@ -29,12 +28,10 @@ def mock_holdings() -> ETFHoldings:
 class TestListETFs:
     """Tests for GET /api/etfs endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_returns_available_etfs(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_returns_available_etfs(self, client: AsyncClient) -> None:
         """Test that endpoint returns list of available ETFs."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/etfs")
+        response = await client.get("/api/etfs")
 
         assert response.status_code == 200
         data = response.json()
@@ -42,12 +39,10 @@ class TestListETFs:
         assert len(data) > 0
         assert all("ticker" in etf and "name" in etf for etf in data)
 
-    @pytest.mark.asyncio
-    async def test_contains_major_etfs(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_contains_major_etfs(self, client: AsyncClient) -> None:
         """Test that response includes major ETFs."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/etfs")
+        response = await client.get("/api/etfs")
 
         tickers = [etf["ticker"] for etf in response.json()]
         assert "SPY" in tickers
@@ -58,29 +53,23 @@ class TestListETFs:
 class TestGetHoldings:
     """Tests for GET /api/holdings/{ticker} endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_invalid_ticker_returns_404(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalid_ticker_returns_404(self, client: AsyncClient) -> None:
         """Test that invalid ticker returns 404 error."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/api/holdings/INVALID")
+        response = await client.get("/api/holdings/INVALID")
 
         assert response.status_code == 404
         assert "not found" in response.json()["detail"].lower()
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="session")
     async def test_valid_ticker_returns_holdings(
-        self, mock_holdings: ETFHoldings
+        self, client: AsyncClient, mock_holdings: ETFHoldings
     ) -> None:
         """Test that valid ticker returns holdings data."""
         with patch("app.main.get_etf_holdings", new_callable=AsyncMock) as mock_get:
             mock_get.return_value = mock_holdings
 
-            transport = ASGITransport(app=app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                response = await client.get("/api/holdings/SPY")
+            response = await client.get("/api/holdings/SPY")
 
         assert response.status_code == 200
         data = response.json()
@@ -88,17 +77,30 @@ class TestGetHoldings:
         assert data["name"] == "SPDR S&P 500 ETF Trust"
         assert len(data["holdings"]) == 3
 
-    @pytest.mark.asyncio
-    async def test_sec_unavailable_returns_503(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_holdings_response_fields(
+        self, client: AsyncClient, mock_holdings: ETFHoldings
+    ) -> None:
+        """Test that holdings are serialized with only the public fields."""
+        with patch("app.main.get_etf_holdings", new_callable=AsyncMock) as mock_get:
+            mock_get.return_value = mock_holdings
+
+            response = await client.get("/api/holdings/SPY")
+
+        assert response.json()["holdings"][0] == {
+            "name": "Apple Inc",
+            "cusip": "037833100",
+            "percentage": 7.0,
+            "value": 1000000.0,
+        }
+
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_sec_unavailable_returns_503(self, client: AsyncClient) -> None:
         """Test that SEC data unavailability returns 503 error."""
         with patch("app.main.get_etf_holdings", new_callable=AsyncMock) as mock_get:
             mock_get.return_value = None
 
-            transport = ASGITransport(app=app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                response = await client.get("/api/holdings/SPY")
+            response = await client.get("/api/holdings/SPY")
 
         assert response.status_code == 503
         assert "unavailable" in response.json()["detail"].lower()
@@ -107,45 +109,39 @@ class TestGetHoldings:
 class TestOverlapAnalysis:
     """Tests for POST /api/overlap endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_invalid_ticker1_returns_404(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalid_ticker1_returns_404(self, client: AsyncClient) -> None:
         """Test that invalid first ticker returns 404 error."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                "/api/overlap",
-                json={"ticker1": "INVALID", "ticker2": "SPY"},
-            )
+        response = await client.post(
+            "/api/overlap",
+            json={"ticker1": "INVALID", "ticker2": "SPY"},
+        )
 
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_invalid_ticker2_returns_404(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_invalid_ticker2_returns_404(self, client: AsyncClient) -> None:
         """Test that invalid second ticker returns 404 error."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                "/api/overlap",
-                json={"ticker1": "SPY", "ticker2": "INVALID"},
-            )
+        response = await client.post(
+            "/api/overlap",
+            json={"ticker1": "SPY", "ticker2": "INVALID"},
+        )
 
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
-    async def test_same_ticker_returns_400(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_same_ticker_returns_400(self, client: AsyncClient) -> None:
         """Test that comparing same ticker returns 400 error."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.post(
-                "/api/overlap",
-                json={"ticker1": "SPY", "ticker2": "SPY"},
-            )
+        response = await client.post(
+            "/api/overlap",
+            json={"ticker1": "SPY", "ticker2": "SPY"},
+        )
 
         assert response.status_code == 400
         assert "different" in response.json()["detail"].lower()
 
-    @pytest.mark.asyncio
-    async def test_valid_overlap_request(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_valid_overlap_request(self, client: AsyncClient) -> None:
         """Test successful overlap analysis."""
         holdings_spy = ETFHoldings(
             ticker="SPY",
@@ -168,14 +164,10 @@ class TestOverlapAnalysis:
             return holdings_spy if ticker == "SPY" else holdings_qqq
 
         with patch("app.main.get_etf_holdings", side_effect=mock_get_holdings):
-            transport = ASGITransport(app=app)
-            async with AsyncClient(
-                transport=transport, base_url="http://test"
-            ) as client:
-                response = await client.post(
-                    "/api/overlap",
-                    json={"ticker1": "SPY", "ticker2": "QQQ"},
-                )
+            response = await client.post(
+                "/api/overlap",
+                json={"ticker1": "SPY", "ticker2": "QQQ"},
+            )
 
         assert response.status_code == 200
         data = response.json()
@@ -189,12 +181,10 @@ class TestOverlapAnalysis:
 class TestHealthCheck:
     """Tests for GET /health endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_health_check(self) -> None:
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_health_check(self, client: AsyncClient) -> None:
         """Test health check endpoint returns healthy status."""
-        transport = ASGITransport(app=app)
-        async with AsyncClient(transport=transport, base_url="http://test") as client:
-            response = await client.get("/health")
+        response = await client.get("/health")
 
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
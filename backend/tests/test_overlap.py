@@ -103,6 +103,23 @@ class TestCalculateOverlap:
         assert result.overlap_percentage == 8.0
         assert result.common_holdings_count == 1
 
+    def test_name_matching_ignores_surrounding_whitespace(self) -> None:
+        """Test that name matching ignores leading and trailing whitespace."""
+        holdings1 = ETFHoldings(
+            ticker="ETF1",
+            name="Test ETF 1",
+            holdings=[Holding(name=" Apple Inc ", cusip=None, percentage=10.0)],
+        )
+        holdings2 = ETFHoldings(
+            ticker="ETF2",
+            name="Test ETF 2",
+            holdings=[Holding(name="APPLE INC", cusip=None, percentage=8.0)],
+        )
+
+        result = calculate_overlap(holdings1, holdings2)
+
+        assert result.common_holdings_count == 1
+
     def test_top_overlapping_limited_to_10(self) -> None:
         """Test that top overlapping is limited to 10 holdings."""
         holdings = [
@@ -162,3 +179,36 @@ class TestCalculateOverlap:
         assert overlap.weight_etf1 == 7.0
         assert overlap.weight_etf2 == 10.0
         assert overlap.overlap_contribution == 7.0
+
+    def test_top_overlapping_sorted_by_contribution(self) -> None:
+        """Test that top overlapping holdings are ordered by contribution."""
+        holdings = [
+            Holding(name=f"Stock {i}", cusip=f"CUSIP{i:03d}", percentage=float(i))
+            for i in range(1, 16)
+        ]
+
+        holdings1 = ETFHoldings(ticker="ETF1", name="Test ETF 1", holdings=holdings)
+        holdings2 = ETFHoldings(ticker="ETF2", name="Test ETF 2", holdings=holdings)
+
+        result = calculate_overlap(holdings1, holdings2)
+
+        contributions = [h.overlap_contribution for h in result.top_overlapping]
+        assert contributions == [float(i) for i in range(15, 5, -1)]
+
+    def test_name_matching_when_cusip_differs(self) -> None:
+        """Test that name matching is used when the CUSIP lookup misses."""
+        holdings1 = ETFHoldings(
+            ticker="ETF1",
+            name="Test ETF 1",
+            holdings=[Holding(name="Apple Inc", cusip=None, percentage=10.0)],
+        )
+        holdings2 = ETFHoldings(
+            ticker="ETF2",
+            name="Test ETF 2",
+            holdings=[Holding(name="Apple Inc", cusip="037833100", percentage=4.0)],
+        )
+
+        result = calculate_overlap(holdings1, holdings2)
+
+        assert result.overlap_percentage == 4.0
+        assert result.common_holdings_count == 1
@@ -0,0 +1,680 @@
+"""Tests for SEC N-PORT parsing and holdings caching."""
+
+import asyncio
+import gzip
+import os
+import threading
+import time
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from app import sec_parser
+from app.sec_parser import ETFHoldings, Holding, get_etf_holdings
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path):
+    """Isolate caches and rate-limit state from other tests.
+
+    The disk cache points at a temp dir, the memory cache starts empty, and
+    the SEC request budget starts full.
+    """
+    sec_parser._MEM_CACHE.clear()
+    with (
+        patch.object(sec_parser, "CACHE_DIR", tmp_path),
+        patch.object(sec_parser, "_rate_limit_full_at", 0.0),
+    ):
+        yield tmp_path
+    sec_parser._MEM_CACHE.clear()
+
+
+def make_holdings(ticker: str = "SPY") -> ETFHoldings:
+    """Create sample holdings for testing."""
+    return ETFHoldings(
+        ticker=ticker,
+        name="Test ETF",
+        holdings=[
+            Holding(name="Apple Inc", cusip="037833100", percentage=7.0, value=100.0),
+            Holding(name="Microsoft Corp", cusip="594918104", percentage=6.5),
+        ],
+    )
+
+
+class TestMemoryCache:
+    """Tests for the in-process holdings cache."""
+
+    @pytest.mark.asyncio
+    async def test_memory_hit_skips_disk(self) -> None:
+        """Test that a memory cache hit does not touch the disk cache."""
+        holdings = make_holdings()
+        sec_parser._save_to_memory(holdings, datetime.now())
+
+        with patch.object(sec_parser, "_load_from_cache") as mock_load:
+            result = await get_etf_holdings("spy")
+
+        assert result is holdings
+        mock_load.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_populates_memory(self) -> None:
+        """Test that loading from disk stores the result in memory."""
+        sec_parser._save_to_cache(make_holdings())
+
+        result = await get_etf_holdings("SPY")
+
+        assert result is not None
+        assert sec_parser._load_from_memory("SPY") is result
+
+    def test_expired_entry_is_evicted(self) -> None:
+        """Test that entries older than the cache expiry are dropped."""
+        stale = datetime.now() - timedelta(hours=sec_parser.CACHE_EXPIRY_HOURS + 1)
+        sec_parser._save_to_memory(make_holdings(), stale)
+
+        assert sec_parser._load_from_memory("SPY") is None
+        assert "SPY" not in sec_parser._MEM_CACHE
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Test that the cache is capped at the configured number of entries."""
+        with patch.object(sec_parser, "MEMORY_CACHE_MAX_ENTRIES", 2):
+            sec_parser._save_to_memory(make_holdings("SPY"), datetime.now())
+            sec_parser._save_to_memory(make_holdings("QQQ"), datetime.now())
+            sec_parser._load_from_memory("SPY")
+            sec_parser._save_to_memory(make_holdings("VOO"), datetime.now())
+
+        assert list(sec_parser._MEM_CACHE) == ["SPY", "VOO"]
+
+
+class TestConcurrentFetch:
+    """Tests for coalescing concurrent SEC fetches."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(self) -> None:
+        """Test that concurrent cache misses for a ticker fetch only once."""
+        calls = 0
+
+        async def fake_fetch(ticker: str) -> ETFHoldings:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return make_holdings(ticker)
+
+        with patch.object(sec_parser, "_fetch_etf_holdings", side_effect=fake_fetch):
+            results = await asyncio.gather(
+                get_etf_holdings("SPY"), get_etf_holdings("spy")
+            )
+
+        assert calls == 1
+        assert results[0] is results[1]
+        assert sec_parser._INFLIGHT == {}
+
+    @pytest.mark.asyncio
+    async def test_error_after_all_callers_cancelled_is_logged(
+        self, caplog: pytest.LogCaptureFixture
+    ) -> None:
+        """Test that a fetch error is retrieved even when nobody awaits it."""
+        started = asyncio.Event()
+
+        async def failing_fetch(ticker: str) -> ETFHoldings:
+            started.set()
+            await asyncio.sleep(0.01)
+            raise OSError("disk full")
+
+        with patch.object(sec_parser, "_fetch_etf_holdings", side_effect=failing_fetch):
+            caller = asyncio.create_task(get_etf_holdings("SPY"))
+            await started.wait()
+            caller.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+            task = sec_parser._INFLIGHT["SPY"]
+            with pytest.raises(OSError):
+                await task
+
+        assert sec_parser._INFLIGHT == {}
+        assert "Failed to fetch holdings for SPY" in caplog.text
+
+
+NPORT_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<edgarSubmission xmlns="http://www.sec.gov/edgar/nport">
+  <formData>
+    <invstOrSecs>
+      <invstOrSec>
+        <name>Microsoft Corp</name>
+        <cusip>594918104</cusip>
+        <valUSD>950000.00</valUSD>
+        <pctVal>6.5</pctVal>
+      </invstOrSec>
+      <invstOrSec>
+        <name>Apple Inc</name>
+        <cusip>037833100</cusip>
+        <valUSD>1000000.00</valUSD>
+        <pctVal>7.0</pctVal>
+      </invstOrSec>
+      <invstOrSec>
+        <name>Cash Collateral</name>
+        <pctVal>-0.1</pctVal>
+      </invstOrSec>
+    </invstOrSecs>
+  </formData>
+</edgarSubmission>
+""".encode()
+
+
+async def parse_streamed(xml: bytes, chunk_size: int = 50) -> list[Holding]:
+    """Parse a filing through the streaming path, fed in small chunks."""
+
+    async def fake_stream(session: object, url: str) -> AsyncIterator[bytes]:
+        for i in range(0, len(xml), chunk_size):
+            yield xml[i : i + chunk_size]
+
+    with patch.object(sec_parser, "_fetch_xml_streaming", fake_stream):
+        return await sec_parser._stream_nport_holdings(None, "url")
+
+
+class TestParseNportXml:
+    """Tests for N-PORT XML parsing."""
+
+    @pytest.mark.asyncio
+    async def test_parses_namespaced_holdings(self) -> None:
+        """Test that holdings are extracted in document order."""
+        holdings = await parse_streamed(NPORT_XML)
+
+        assert [h.name for h in holdings] == ["Microsoft Corp", "Apple Inc"]
+        assert holdings[1].cusip == "037833100"
+        assert holdings[1].percentage == 7.0
+        assert holdings[1].value == 1000000.0
+
+    @pytest.mark.asyncio
+    async def test_parses_holdings_without_namespace(self) -> None:
+        """Test that filings without a default namespace are supported."""
+        xml = NPORT_XML.replace(b' xmlns="http://www.sec.gov/edgar/nport"', b"")
+
+        holdings = await parse_streamed(xml)
+
+        assert len(holdings) == 2
+
+    @pytest.mark.asyncio
+    async def test_parses_holdings_with_other_namespace_prefix(self) -> None:
+        """Test that fields are matched by local name in any namespace."""
+        xml = NPORT_XML.replace(
+            b'xmlns="http://www.sec.gov/edgar/nport"', b'xmlns:n="urn:example"'
+        )
+        xml = xml.replace(b"<", b"<n:").replace(b"<n:/", b"</n:")
+        xml = xml.replace(b"<n:?xml", b"<?xml")
+
+        holdings = await parse_streamed(xml)
+
+        assert [h.cusip for h in holdings] == ["594918104", "037833100"]
+
+    @pytest.mark.asyncio
+    async def test_ignores_comments_in_holdings(self) -> None:
+        """Test that comments inside a holding element are skipped."""
+        xml = NPORT_XML.replace(
+            b"<name>Apple Inc</name>", b"<!-- c --><name>Apple Inc</name>"
+        )
+
+        holdings = await parse_streamed(xml)
+
+        assert holdings[1].name == "Apple Inc"
+
+    @pytest.mark.asyncio
+    async def test_skips_non_positive_weights(self) -> None:
+        """Test that holdings without a positive weight are excluded."""
+        holdings = await parse_streamed(NPORT_XML)
+
+        assert all(h.name != "Cash Collateral" for h in holdings)
+
+    @pytest.mark.asyncio
+    async def test_invalid_xml_returns_empty(self) -> None:
+        """Test that malformed XML yields no holdings."""
+        assert await parse_streamed(b"<edgarSubmission><invstOrSec>") == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_xml_closes_stream(self) -> None:
+        """Test that the response stream is closed as soon as parsing fails."""
+        closed = False
+
+        async def fake_stream(session: object, url: str) -> AsyncIterator[bytes]:
+            nonlocal closed
+            try:
+                yield b"<edgarSubmission><invstOrSec></bad>"
+                yield b"</edgarSubmission>"
+            finally:
+                closed = True
+
+        with patch.object(sec_parser, "_fetch_xml_streaming", fake_stream):
+            holdings = await sec_parser._stream_nport_holdings(None, "url")
+
+        assert holdings == []
+        assert closed
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "prefix",
+        [b"\n", b"  \r\n\t", b"\xef\xbb\xbf", b"\n\xef\xbb\xbf\n"],
+        ids=["newline", "whitespace", "bom", "bom-with-whitespace"],
+    )
+    async def test_skips_padding_before_xml_declaration(self, prefix: bytes) -> None:
+        """Test that whitespace or a BOM before the declaration is ignored."""
+        holdings = await parse_streamed(prefix + NPORT_XML)
+
+        assert [h.name for h in holdings] == ["Microsoft Corp", "Apple Inc"]
+
+    @pytest.mark.asyncio
+    async def test_skips_whitespace_only_leading_chunks(self) -> None:
+        """Test that leading whitespace spanning several chunks is ignored."""
+        holdings = await parse_streamed(b"\n" * 120 + NPORT_XML)
+
+        assert len(holdings) == 2
+
+
+def make_nport_xml(count: int) -> bytes:
+    """Create a synthetic N-PORT filing with the given number of holdings."""
+    rows = "".join(
+        f"<invstOrSec><name>Holding {i}</name><cusip>{i:09d}</cusip>"
+        f"<valUSD>{i}.00</valUSD><pctVal>0.01</pctVal></invstOrSec>"
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<edgarSubmission xmlns="http://www.sec.gov/edgar/nport">'
+        f"<formData><invstOrSecs>{rows}</invstOrSecs></formData></edgarSubmission>"
+    ).encode()
+
+
+class TestStreamingThreads:
+    """Tests for parsing streamed filings in worker threads."""
+
+    @pytest.mark.asyncio
+    async def test_parser_stays_on_one_thread(self) -> None:
+        """Test that a filing's parser is created and fed on a single thread."""
+        threads: set[int] = set()
+        new_parser = sec_parser._new_nport_parser
+        feed_parser = sec_parser._feed_nport_parser
+
+        def tracked_new_parser() -> object:
+            threads.add(threading.get_ident())
+            return new_parser()
+
+        def tracked_feed(*args: object) -> None:
+            threads.add(threading.get_ident())
+            feed_parser(*args)
+
+        with (
+            patch.object(sec_parser, "_new_nport_parser", tracked_new_parser),
+            patch.object(sec_parser, "_feed_nport_parser", tracked_feed),
+        ):
+            holdings = await parse_streamed(make_nport_xml(500), chunk_size=1024)
+
+        assert len(holdings) == 500
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_back_to_back_and_concurrent_filings(self) -> None:
+        """Test that repeated and concurrent streamed filings parse cleanly."""
+        xml = make_nport_xml(2000)
+        chunk_size = 64 * 1024
+
+        async def fake_stream(session: object, url: str) -> AsyncIterator[bytes]:
+            for i in range(0, len(xml), chunk_size):
+                yield xml[i : i + chunk_size]
+
+        with patch.object(sec_parser, "_fetch_xml_streaming", fake_stream):
+            for _ in range(3):
+                results = await asyncio.gather(
+                    *(sec_parser._stream_nport_holdings(None, "url") for _ in range(4))
+                )
+
+                assert [len(holdings) for holdings in results] == [2000] * 4
+
+
+class TestFetchETFHoldings:
+    """Tests for fetching holdings from SEC."""
+
+    @pytest.mark.asyncio
+    async def test_sorts_and_caches_fetched_holdings(self) -> None:
+        """Test that fetched holdings are sorted by weight and cached."""
+        parsed = [
+            Holding(name="Small", cusip="000000001", percentage=1.0),
+            Holding(name="Large", cusip="000000002", percentage=9.0),
+        ]
+
+        with (
+            patch.object(sec_parser, "_get_session"),
+            patch.object(sec_parser, "_get_latest_nport_url", return_value="url"),
+            patch.object(sec_parser, "_stream_nport_holdings", return_value=parsed),
+        ):
+            result = await get_etf_holdings("SPY")
+
+        assert result is not None
+        assert [h.name for h in result.holdings] == ["Large", "Small"]
+        assert sec_parser._load_from_cache("SPY") == result
+        assert sec_parser._load_from_memory("SPY") is result
+
+
+SUBMISSIONS_JSON = (
+    b'{"filings": {"recent": {"form": ["N-CSR", "NPORT-P"],'
+    b' "accessionNumber": ["0000000000-24-000001", "0000000000-24-000002"]}}}'
+)
+
+INDEX_JSON = b'{"directory": {"item": [{"name": "primary_doc.xml"}]}}'
+
+
+class TestSubmissionsRevalidation:
+    """Tests for conditional fetches of the SEC submissions document."""
+
+    @pytest.mark.asyncio
+    async def test_saves_validators_with_accession(self) -> None:
+        """Test that a full response records its validators for next time."""
+        with (
+            patch.object(
+                sec_parser,
+                "_fetch_if_modified",
+                return_value=(SUBMISSIONS_JSON, '"abc"', None),
+            ) as mock_fetch,
+            patch.object(sec_parser, "_fetch_with_rate_limit", return_value=INDEX_JSON),
+        ):
+            url = await sec_parser._get_latest_nport_url(None, "884394")
+
+        assert url is not None
+        assert "000000000024000002/primary_doc.xml" in url
+        assert mock_fetch.call_args.kwargs == {"etag": None, "last_modified": None}
+        assert sec_parser._load_submissions_cache("0000884394") == {
+            "etag": '"abc"',
+            "last_modified": None,
+            "accession": "0000000000-24-000002",
+        }
+
+    @pytest.mark.asyncio
+    async def test_not_modified_reuses_cached_accession(self) -> None:
+        """Test that a 304 response reuses the accession from the last lookup."""
+        sec_parser._save_submissions_cache(
+            "0000884394", "0000000000-24-000002", None, "Mon, 01 Jan 2024 00:00:00 GMT"
+        )
+
+        with (
+            patch.object(
+                sec_parser,
+                "_fetch_if_modified",
+                return_value=(None, None, "Mon, 01 Jan 2024 00:00:00 GMT"),
+            ) as mock_fetch,
+            patch.object(sec_parser, "_fetch_with_rate_limit", return_value=INDEX_JSON),
+        ):
+            url = await sec_parser._get_latest_nport_url(None, "884394")
+
+        assert url is not None
+        assert "000000000024000002/primary_doc.xml" in url
+        assert mock_fetch.call_args.kwargs == {
+            "etag": None,
+            "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        }
+
+    @pytest.mark.asyncio
+    async def test_picks_newest_nport_including_amendments(self) -> None:
+        """Test that the first listed N-PORT form wins, amended or not."""
+        submissions = SUBMISSIONS_JSON.replace(b'"N-CSR"', b'"NPORT-P/A"')
+
+        with (
+            patch.object(
+                sec_parser, "_fetch_if_modified", return_value=(submissions, None, None)
+            ),
+            patch.object(sec_parser, "_fetch_with_rate_limit", return_value=INDEX_JSON),
+        ):
+            url = await sec_parser._get_latest_nport_url(None, "884394")
+
+        assert url is not None
+        assert "000000000024000001/primary_doc.xml" in url
+
+    def test_lookup_without_validators_is_not_saved(self) -> None:
+        """Test that responses SEC cannot revalidate are not cached."""
+        sec_parser._save_submissions_cache("0000884394", "acc", None, None)
+
+        assert sec_parser._load_submissions_cache("0000884394") is None
+
+
+class TestETFHoldingsIndexes:
+    """Tests for the cached holdings lookups."""
+
+    def test_indexes_are_built_once(self) -> None:
+        """Test that lookups are cached on the holdings instance."""
+        holdings = make_holdings()
+
+        assert holdings.by_cusip is holdings.by_cusip
+        assert holdings.by_name is holdings.by_name
+
+    def test_index_contents(self) -> None:
+        """Test that lookups key holdings by CUSIP and upper-cased name."""
+        holdings = make_holdings()
+
+        assert holdings.by_cusip["037833100"].name == "Apple Inc"
+        assert holdings.by_name["MICROSOFT CORP"].cusip == "594918104"
+
+
+class TestWarmMemoryCache:
+    """Tests for preloading the in-process cache at startup."""
+
+    def test_loads_disk_caches(self) -> None:
+        """Test that valid disk caches are loaded into memory."""
+        sec_parser._save_to_cache(make_holdings("QQQ"))
+
+        sec_parser.warm_memory_cache()
+
+        assert list(sec_parser._MEM_CACHE) == ["QQQ"]
+        cached = sec_parser._load_from_memory("QQQ")
+        assert cached is not None
+        assert cached._by_cusip is not None
+
+    def test_failing_cache_is_skipped(self) -> None:
+        """Test that one cache failing to load does not stop the others."""
+        sec_parser._save_to_cache(make_holdings("QQQ"))
+        load_from_cache = sec_parser._load_from_cache
+
+        def flaky_load(ticker: str) -> Optional[ETFHoldings]:
+            if ticker == "SPY":
+                raise RuntimeError("unexpected cache contents")
+            return load_from_cache(ticker)
+
+        with patch.object(sec_parser, "_load_from_cache", flaky_load):
+            sec_parser.warm_memory_cache()
+
+        assert list(sec_parser._MEM_CACHE) == ["QQQ"]
+
+
+class TestDiskCache:
+    """Tests for the on-disk holdings cache."""
+
+    def test_round_trip(self) -> None:
+        """Test that saved holdings load back unchanged."""
+        holdings = make_holdings()
+        sec_parser._save_to_cache(holdings)
+
+        loaded = sec_parser._load_from_cache("SPY")
+
+        assert loaded == holdings
+
+    def test_corrupt_cache_returns_none(self) -> None:
+        """Test that an unreadable cache file is treated as a miss."""
+        sec_parser._get_cache_path("SPY").write_bytes(gzip.compress(b"{not json"))
+
+        assert sec_parser._load_from_cache("SPY") is None
+
+    def test_truncated_cache_returns_none(self) -> None:
+        """Test that a partially written cache file is treated as a miss."""
+        sec_parser._save_to_cache(make_holdings())
+        cache_path = sec_parser._get_cache_path("SPY")
+        cache_path.write_bytes(cache_path.read_bytes()[:-10])
+
+        assert sec_parser._load_from_cache("SPY") is None
+
+    def test_cache_is_compressed_and_written_atomically(
+        self, isolated_cache: Path
+    ) -> None:
+        """Test that the cache is gzip data with no temp file left behind."""
+        sec_parser._save_to_cache(make_holdings())
+
+        assert sorted(p.name for p in isolated_cache.iterdir()) == [
+            "SPY_holdings.json.gz",
+            "SPY_holdings.json.gz.sha256",
+        ]
+        data = gzip.decompress(sec_parser._get_cache_path("SPY").read_bytes())
+        assert b"Apple Inc" in data
+
+    def test_mismatched_columns_are_a_miss(self) -> None:
+        """Test that a cache with columns of different lengths is rejected."""
+        sec_parser._get_cache_path("SPY").write_bytes(
+            gzip.compress(
+                b'{"ticker": "SPY", "name": "Test ETF", "columns": {"name": ["A"],'
+                b' "cusip": [], "percentage": [1.0], "value": [null]}}'
+            )
+        )
+
+        assert sec_parser._load_from_cache("SPY") is None
+
+    def test_old_row_format_is_a_miss(self) -> None:
+        """Test that caches written in the old row-wise format are refetched."""
+        sec_parser._get_cache_path("SPY").write_bytes(
+            gzip.compress(b'{"ticker": "SPY", "name": "Test ETF", "holdings": []}')
+        )
+
+        assert sec_parser._load_from_cache("SPY") is None
+
+    @pytest.mark.parametrize(
+        "payload",
+        [
+            b"[]",
+            b'{"ticker": "SPY", "name": "Test ETF", "columns": []}',
+            b'{"ticker": "SPY", "name": "Test ETF", "columns": {"name": [null],'
+            b' "cusip": [null], "percentage": [1.0], "value": [null]}}',
+        ],
+        ids=["list-payload", "list-columns", "null-name"],
+    )
+    def test_wrong_shape_is_a_miss(self, payload: bytes) -> None:
+        """Test that valid JSON with an unexpected shape is treated as a miss."""
+        sec_parser._get_cache_path("SPY").write_bytes(gzip.compress(payload))
+
+        assert sec_parser._load_from_cache("SPY") is None
+
+    def test_atomic_writes_use_unique_temp_files(self, isolated_cache: Path) -> None:
+        """Test that concurrent writers of one path get separate temp files."""
+        temp_paths = []
+        replace = os.replace
+
+        def recording_replace(src: str, dst: Path) -> None:
+            temp_paths.append(src)
+            replace(src, dst)
+
+        with patch.object(sec_parser.os, "replace", recording_replace):
+            sec_parser._write_atomic(isolated_cache / "out", b"one")
+            sec_parser._write_atomic(isolated_cache / "out", b"two")
+
+        assert len(set(temp_paths)) == 2
+        assert (isolated_cache / "out").read_bytes() == b"two"
+
+    def test_failed_atomic_write_removes_temp_file(self, isolated_cache: Path) -> None:
+        """Test that a failed rename leaves no temp file behind."""
+        with (
+            patch.object(sec_parser.os, "replace", side_effect=OSError("denied")),
+            pytest.raises(OSError),
+        ):
+            sec_parser._write_atomic(isolated_cache / "out", b"data")
+
+        assert list(isolated_cache.iterdir()) == []
+
+    def test_unchanged_holdings_only_touch_the_file(self) -> None:
+        """Test that saving identical holdings restarts expiry without a rewrite."""
+        sec_parser._save_to_cache(make_holdings())
+        cache_path = sec_parser._get_cache_path("SPY")
+        os.utime(cache_path, (0, 0))
+
+        with patch.object(sec_parser, "_write_atomic") as mock_write:
+            sec_parser._save_to_cache(make_holdings())
+
+        mock_write.assert_not_called()
+        assert sec_parser._is_cache_valid(cache_path)
+
+    def test_changed_holdings_are_rewritten(self) -> None:
+        """Test that different holdings replace the cached file."""
+        sec_parser._save_to_cache(make_holdings())
+        changed = make_holdings()
+        changed.holdings.pop()
+
+        sec_parser._save_to_cache(changed)
+
+        assert sec_parser._load_from_cache("SPY") == changed
+
+    def test_missing_digest_forces_rewrite(self) -> None:
+        """Test that a cache file without a digest sidecar is rewritten."""
+        cache_path = sec_parser._get_cache_path("SPY")
+        cache_path.write_bytes(b"stale")
+
+        sec_parser._save_to_cache(make_holdings())
+
+        assert sec_parser._load_from_cache("SPY") == make_holdings()
+
+
+class TestHolding:
+    """Tests for the Holding dataclass."""
+
+    def test_name_upper_is_derived(self) -> None:
+        """Test that the upper-cased name is computed on construction."""
+        holding = Holding(name="Apple Inc", cusip=None, percentage=1.0)
+
+        assert holding.name_upper == "APPLE INC"
+
+    def test_match_keys_are_interned(self) -> None:
+        """Test that equal CUSIPs and names share one string object."""
+        cusip = "".join(["0378", "33100"])
+        first = Holding(name="Apple Inc", cusip=cusip, percentage=1.0)
+        second = Holding(name="APPLE INC", cusip="037833100", percentage=2.0)
+
+        assert first.cusip is second.cusip
+        assert first.name_upper is second.name_upper
+
+    def test_name_upper_not_cached_to_disk(self) -> None:
+        """Test that the derived name is recomputed rather than stored."""
+        sec_parser._save_to_cache(make_holdings())
+
+        data = gzip.decompress(sec_parser._get_cache_path("SPY").read_bytes())
+
+        assert b"name_upper" not in data
+        assert b"APPLE INC" not in data
+
+
+class TestRateLimit:
+    """Tests for spacing out SEC requests."""
+
+    @pytest.mark.asyncio
+    async def test_first_request_does_not_wait(self) -> None:
+        """Test that no delay is added when no request happened recently."""
+        start = time.monotonic()
+
+        await sec_parser._wait_for_rate_limit(1.0, burst=1)
+
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_burst_does_not_wait(self) -> None:
+        """Test that requests within the burst size all start immediately."""
+        start = time.monotonic()
+
+        await asyncio.gather(
+            *(sec_parser._wait_for_rate_limit(1.0, burst=3) for _ in range(3))
+        )
+
+        assert time.monotonic() - start < 0.5
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_beyond_burst_are_spaced(self) -> None:
+        """Test that requests past the burst each wait for their own slot."""
+        start = time.monotonic()
+
+        await asyncio.gather(
+            *(sec_parser._wait_for_rate_limit(0.05, burst=2) for _ in range(4))
+        )
+
+        assert time.monotonic() - start >= 0.1